@@ -1,6 +1,6 @@
 import asyncio
 import os
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
 from dotenv import load_dotenv
 from openai import AsyncOpenAI, OpenAI
@@ -9,27 +9,58 @@ from openai import AsyncOpenAI, OpenAI
 class EmbeddingModel:
     """Helper for generating embeddings via the OpenAI API."""
 
-    def __init__(self, embeddings_model_name: str = "text-embedding-3-small"):
-        load_dotenv()
-        self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        if self.openai_api_key is None:
+    def __init__(
+        self,
+        embeddings_model_name: str = "text-embedding-3-small",
+        batch_size: int = 1024,
+        api_key: Optional[str] = None,
+    ):
+        # An explicit key lets callers serve several users from one process
+        # without touching the shared environment.
+        if api_key is None:
+            load_dotenv()
+            api_key = os.getenv("OPENAI_API_KEY")
+        if api_key is None:
             raise ValueError(
                 "OPENAI_API_KEY environment variable is not set. "
-                "Please configure it with your OpenAI API key."
+                "Please configure it with your OpenAI API key or pass api_key."
             )
+        self.openai_api_key = api_key
 
         self.embeddings_model_name = embeddings_model_name
-        self.async_client = AsyncOpenAI()
-        self.client = OpenAI()
+        # The embeddings endpoint accepts at most 2048 inputs per request.
+        self.batch_size = batch_size
+        self.async_client = AsyncOpenAI(api_key=self.openai_api_key)
+        self.client = OpenAI(api_key=self.openai_api_key)
+
+    def _batches(self, list_of_text: Iterable[str]) -> List[List[str]]:
+        texts = list(list_of_text)
+        return [
+            texts[i : i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
 
     async def async_get_embeddings(self, list_of_text: Iterable[str]) -> List[List[float]]:
-        """Return embeddings for ``list_of_text`` using the async client."""
-
-        embedding_response = await self.async_client.embeddings.create(
-            input=list(list_of_text), model=self.embeddings_model_name
+        """Return embeddings for ``list_of_text`` using the async client.
+
+        Inputs are split into batches of ``batch_size`` that are requested
+        concurrently; the embeddings are returned in input order.
+        """
+
+        embedding_responses = await asyncio.gather(
+            *(
+                self.async_client.embeddings.create(
+                    input=batch, model=self.embeddings_model_name
+                )
+                for batch in self._batches(list_of_text)
+            )
         )
 
-        return [item.embedding for item in embedding_response.data]
+        return [
+            item.embedding
+            for embedding_response in embedding_responses
+            for item in embedding_response.data
+        ]
 
     async def async_get_embedding(self, text: str) -> List[float]:
         """Return an embedding for a single text using the async client."""
@@ -43,11 +74,13 @@ class EmbeddingModel:
     def get_embeddings(self, list_of_text: Iterable[str]) -> List[List[float]]:
         """Return embeddings for ``list_of_text`` using the sync client."""
 
-        embedding_response = self.client.embeddings.create(
-            input=list(list_of_text), model=self.embeddings_model_name
-        )
-
-        return [item.embedding for item in embedding_response.data]
+        embeddings: List[List[float]] = []
+        for batch in self._batches(list_of_text):
+            embedding_response = self.client.embeddings.create(
+                input=batch, model=self.embeddings_model_name
+            )
+            embeddings.extend(item.embedding for item in embedding_response.data)
+        return embeddings
 
     def get_embedding(self, text: str) -> List[float]:
         """Return an embedding for a single text using the sync client."""
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Optional, Sequence
 
 import PyPDF2
 
@@ -82,6 +82,75 @@ class CharacterTextSplitter:
         return chunks
 
 
+class RecursiveCharacterTextSplitter(CharacterTextSplitter):
+    """Split text on the coarsest natural boundary that yields small pieces.
+
+    Text is broken on paragraphs first, then lines, sentences and words, and
+    only cut mid-word as a last resort. The pieces are then packed greedily
+    into chunks of up to ``chunk_size`` characters, carrying at most
+    ``chunk_overlap`` characters of whole pieces into the next chunk.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 100,
+        separators: Optional[Sequence[str]] = None,
+    ):
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.separators = list(separators or ["\n\n", "\n", ". ", " "])
+
+    def split(self, text: str) -> List[str]:
+        """Split ``text`` into chunks that end on natural boundaries."""
+
+        return self._merge(self._split_pieces(text, self.separators))
+
+    def _split_pieces(self, text: str, separators: List[str]) -> List[str]:
+        if len(text) <= self.chunk_size:
+            return [text] if text else []
+
+        for index, separator in enumerate(separators):
+            if separator in text:
+                remaining = separators[index + 1 :]
+                break
+        else:
+            # No boundary left to split on: fall back to fixed-size slices.
+            return [
+                text[i : i + self.chunk_size]
+                for i in range(0, len(text), self.chunk_size)
+            ]
+
+        parts = text.split(separator)
+        # Keep the separator attached so that joining pieces restores the text.
+        parts = [part + separator for part in parts[:-1]] + [parts[-1]]
+
+        pieces: List[str] = []
+        for part in parts:
+            pieces.extend(self._split_pieces(part, remaining))
+        return pieces
+
+    def _merge(self, pieces: List[str]) -> List[str]:
+        chunks: List[str] = []
+        current: List[str] = []
+        current_length = 0
+
+        for piece in pieces:
+            if current and current_length + len(piece) > self.chunk_size:
+                chunks.append("".join(current).strip())
+                # Carry trailing pieces forward as overlap for the next chunk.
+                while current and (
+                    current_length > self.chunk_overlap
+                    or current_length + len(piece) > self.chunk_size
+                ):
+                    current_length -= len(current.pop(0))
+            current.append(piece)
+            current_length += len(piece)
+
+        if current:
+            chunks.append("".join(current).strip())
+        return [chunk for chunk in chunks if chunk]
+
+
 class PDFLoader:
     """Extract text from PDF files stored at a path."""
 
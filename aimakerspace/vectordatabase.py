@@ -1,7 +1,12 @@
 import asyncio
-from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
+from usearch.index import Index
 
 from aimakerspace.openai_utils.embedding import EmbeddingModel
 
@@ -18,17 +23,91 @@ def cosine_similarity(vector_a: np.ndarray, vector_b: np.ndarray) -> float:
     return float(dot_product / (norm_a * norm_b))
 
 
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Return ``vectors`` as float32 rows scaled to unit L2 norm.
+
+    Once both sides are normalised, cosine similarity is a plain dot product.
+    All-zero rows are left as zeros.
+    """
+
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def quantize_i8(vectors: np.ndarray, scale: float) -> np.ndarray:
+    """Multiply ``vectors`` by ``scale`` and round to int8, clipping overflow.
+
+    Using one ``scale`` for every row keeps inner products proportional to
+    those of the original vectors (by ``scale ** 2``), so quantized rows rank
+    neighbours the same way while using a quarter of the memory of float32.
+    """
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return np.clip(np.round(vectors * scale), -127, 127).astype(np.int8)
+
+
+@contextmanager
+def _atomic_target(path: str) -> Iterator[str]:
+    """Yield a unique temporary path that replaces ``path`` once written.
+
+    Each writer gets its own temporary file, so concurrent writers of the same
+    ``path`` never share a half-written file; the last one to finish wins.
+    """
+
+    directory, name = os.path.split(path)
+    file_descriptor, temp_path = tempfile.mkstemp(
+        dir=directory or ".", prefix=f"{name}.", suffix=".tmp"
+    )
+    os.close(file_descriptor)
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
 class VectorDatabase:
     """Minimal in-memory vector store backed by numpy arrays."""
 
     def __init__(self, embedding_model: Optional[EmbeddingModel] = None):
         self.vectors: Dict[str, np.ndarray] = {}
         self.embedding_model = embedding_model or EmbeddingModel()
+        # Row-normalised (N, D) copy of ``self.vectors`` used for cosine search;
+        # rebuilt lazily after inserts.
+        self._matrix: Optional[np.ndarray] = None
+        self._keys: List[str] = []
 
     def insert(self, key: str, vector: Iterable[float]) -> None:
         """Store ``vector`` so that it can be retrieved with ``key`` later on."""
 
         self.vectors[key] = np.asarray(vector, dtype=float)
+        self._matrix = None
+
+    def _normalized_matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = np.ascontiguousarray(
+                normalize_rows(np.vstack(list(self.vectors.values())))
+            )
+            self._keys = list(self.vectors.keys())
+        return self._matrix
+
+    def _cosine_top_k(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        matrix = self._normalized_matrix()
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            similarities = np.zeros(len(self._keys), dtype=np.float32)
+        else:
+            similarities = matrix @ (query / norm).astype(np.float32)
+
+        if k < len(similarities):
+            top = np.argpartition(-similarities, k)[:k]
+        else:
+            top = np.arange(len(similarities))
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        return [(self._keys[i], float(similarities[i])) for i in top]
 
     def search(
         self,
@@ -42,6 +121,12 @@ class VectorDatabase:
             raise ValueError("k must be a positive integer")
 
         query = np.asarray(query_vector, dtype=float)
+        if not self.vectors:
+            return []
+        if distance_measure is cosine_similarity:
+            # One BLAS matrix-vector product instead of a Python loop per vector.
+            return self._cosine_top_k(query, k)
+
         scores = [
             (key, distance_measure(query, vector))
             for key, vector in self.vectors.items()
@@ -78,6 +163,157 @@ class VectorDatabase:
         return self
 
 
+class HNSWVectorStore:
+    """Approximate nearest-neighbour text store backed by a usearch HNSW index.
+
+    Unlike :class:`VectorDatabase`, queries do not scan every stored vector:
+    the HNSW graph only visits roughly ``log(N) * expansion_search`` candidates,
+    which keeps top-k latency flat as documents grow to thousands of chunks.
+    Vectors are normalised on insert so the index ranks by plain inner
+    product, and stored as int8 by default (see :func:`quantize_i8`); pass
+    ``dtype="f32"`` to keep full precision. Stores can be written to disk with
+    :meth:`save` and memory-mapped back with :meth:`load`.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Optional[EmbeddingModel] = None,
+        ndim: int = 1536,
+        connectivity: int = 16,
+        expansion_add: int = 64,
+        expansion_search: int = 64,
+        dtype: str = "i8",
+    ):
+        self.embedding_model = embedding_model or EmbeddingModel()
+        self.dtype = dtype
+        # int8 quantization scale, fixed from the first batch of vectors added.
+        self.scale: Optional[float] = None
+        self.index = Index(
+            ndim=ndim,
+            metric="ip",
+            dtype=dtype,
+            connectivity=connectivity,
+            expansion_add=expansion_add,
+            expansion_search=expansion_search,
+        )
+        self.chunks: List[str] = []
+
+    def _prepare(self, vectors: Iterable[float]) -> np.ndarray:
+        vectors = normalize_rows(vectors)
+        if self.dtype != "i8":
+            return vectors
+        if self.scale is None:
+            # Map the largest component seen so far onto the full int8 range.
+            largest = float(np.abs(vectors).max())
+            self.scale = 127.0 / largest if largest > 0 else 127.0
+        return quantize_i8(vectors, self.scale)
+
+    def _similarity(self, distance: float) -> float:
+        # usearch reports inner-product *distance* (1 - dot); undo it and, for
+        # int8, the quantization scale so scores are cosine similarities.
+        similarity = 1.0 - float(distance)
+        if self.dtype == "i8":
+            similarity /= self.scale**2
+        return similarity
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def search(self, query_vector: Iterable[float], k: int) -> List[Tuple[str, float]]:
+        """Return up to ``k`` chunks closest to ``query_vector`` with their similarity."""
+
+        if k <= 0:
+            raise ValueError("k must be a positive integer")
+        if not self.chunks:
+            return []
+
+        query = self._prepare(query_vector)[0]
+        matches = self.index.search(query, k)
+        return [
+            (self.chunks[int(key)], self._similarity(distance))
+            for key, distance in zip(matches.keys, matches.distances)
+        ]
+
+    def search_by_vector(
+        self,
+        query_vector: Iterable[float],
+        k: int,
+        return_as_text: bool = False,
+    ) -> Union[List[Tuple[str, float]], List[str]]:
+        """Vector search using a precomputed query embedding."""
+
+        results = self.search(query_vector, k)
+        if return_as_text:
+            return [result[0] for result in results]
+        return results
+
+    def search_by_text(
+        self,
+        query_text: str,
+        k: int,
+        return_as_text: bool = False,
+    ) -> Union[List[Tuple[str, float]], List[str]]:
+        """Vector search using an embedding generated from ``query_text``."""
+
+        query_vector = self.embedding_model.get_embedding(query_text)
+        return self.search_by_vector(query_vector, k, return_as_text)
+
+    async def abuild_from_list(self, list_of_text: List[str]) -> "HNSWVectorStore":
+        """Embed ``list_of_text`` and add every snippet to the HNSW index."""
+
+        if not list_of_text:
+            return self
+
+        embeddings = await self.embedding_model.async_get_embeddings(list_of_text)
+        start = len(self.chunks)
+        keys = np.arange(start, start + len(embeddings))
+        self.index.add(keys, self._prepare(np.vstack(embeddings)))
+        self.chunks.extend(list_of_text)
+        return self
+
+    def save(self, path: str) -> None:
+        """Write the index to ``path.usearch`` and the chunks to ``path.json``.
+
+        Both files are written under unique temporary names and moved into
+        place, the JSON sidecar last, so readers never observe a half-written
+        store even when several processes save the same ``path`` at once.
+        """
+
+        with _atomic_target(f"{path}.usearch") as index_path:
+            self.index.save(index_path)
+        with _atomic_target(f"{path}.json") as sidecar_path:
+            with open(sidecar_path, "w", encoding="utf-8") as file_handle:
+                json.dump(
+                    {"dtype": self.dtype, "scale": self.scale, "chunks": self.chunks},
+                    file_handle,
+                )
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        embedding_model: Optional[EmbeddingModel] = None,
+        view: bool = True,
+    ) -> "HNSWVectorStore":
+        """Load a store written by :meth:`save`.
+
+        With ``view=True`` the index is memory-mapped read-only instead of
+        being copied into RAM. ``embedding_model`` is only required for
+        :meth:`search_by_text` and :meth:`abuild_from_list`.
+        """
+
+        with open(f"{path}.json", encoding="utf-8") as file_handle:
+            metadata = json.load(file_handle)
+
+        store = cls.__new__(cls)
+        store.embedding_model = embedding_model
+        store.dtype = metadata["dtype"]
+        store.scale = metadata["scale"]
+        store.index = Index.restore(f"{path}.usearch", view=view)
+        store.chunks = metadata["chunks"]
+        return store
+
+
 if __name__ == "__main__":
     list_of_text = [
         "I like to eat broccoli and bananas.",
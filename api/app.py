@@ -3,21 +3,46 @@ from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 # Import Pydantic for data validation and settings management
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
 # Import OpenAI client for interacting with OpenAI's API
-from openai import OpenAI
+from openai import AsyncOpenAI
+import asyncio
+import atexit
+import hashlib
+import logging
+import logging.handlers
 import os
+import queue
+import re
 import tempfile
 import random
-from typing import Optional, Dict, List
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
+import orjson
 
 # Import aimakerspace modules for RAG functionality
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from aimakerspace.text_utils import PDFLoader, CharacterTextSplitter
-from aimakerspace.vectordatabase import VectorDatabase
+from aimakerspace.text_utils import PDFLoader, RecursiveCharacterTextSplitter
+from aimakerspace.vectordatabase import HNSWVectorStore
 from aimakerspace.openai_utils.embedding import EmbeddingModel
 
+# Log records are only enqueued on the request path; a background thread
+# writes them to stderr, so a slow pipe never blocks the event loop
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flush queued records on shutdown
+
 # Initialize FastAPI application with a title
 app = FastAPI(title="RAG Chat API with PDF Upload")
 
@@ -31,8 +56,219 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers in requests
 )
 
-# Global storage for vector databases (in production, use proper storage)
-vector_databases: Dict[str, VectorDatabase] = {}
+# Embedding model shared by indexing and query embedding
+EMBEDDING_MODEL_NAME = "text-embedding-3-small"
+
+# Directory the vector indexes are persisted to; /tmp is the only writable
+# location on Vercel, so default to the system temp directory
+VECTOR_INDEX_DIR = os.getenv(
+    "VECTOR_INDEX_DIR", os.path.join(tempfile.gettempdir(), "vector_indexes")
+)
+
+# IDs are generated by upload_pdf; anything else is rejected before it can be
+# turned into a file path
+PDF_ID_PATTERN = re.compile(r"pdf_[0-9a-f]{16}")
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """Metadata recorded for a PDF at ingest time"""
+    filename: str  # Name of the uploaded file
+    chunks_count: int  # Number of chunks indexed
+
+class IndexCache:
+    """Vector stores persisted on disk with an LRU of the ones loaded in memory
+
+    Each store is saved alongside a small ``.meta.json`` file holding its
+    IndexEntry, so PDFs can be listed without loading or paging in any index.
+    """
+
+    def __init__(self, directory: str, max_loaded: int = 16):
+        self.directory = directory
+        self.max_loaded = max_loaded
+        self._loaded: "OrderedDict[str, HNSWVectorStore]" = OrderedDict()
+        self._entries: Dict[str, IndexEntry] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, pdf_id: str) -> str:
+        return os.path.join(self.directory, pdf_id)
+
+    def __contains__(self, pdf_id: str) -> bool:
+        # Check the disk rather than memory so stores written or deleted by
+        # other workers are seen immediately
+        return bool(PDF_ID_PATTERN.fullmatch(pdf_id)) and os.path.exists(self._path(pdf_id) + ".meta.json")
+
+    def ids(self) -> List[str]:
+        """Return the IDs of all persisted stores"""
+        return sorted(
+            name[:-len(".meta.json")]
+            for name in os.listdir(self.directory)
+            if name.endswith(".meta.json") and PDF_ID_PATTERN.fullmatch(name[:-len(".meta.json")])
+        )
+
+    def entry(self, pdf_id: str) -> Optional[IndexEntry]:
+        """Return the ingest-time metadata for a PDF without loading its index"""
+        if pdf_id not in self:
+            self._entries.pop(pdf_id, None)
+            return None
+
+        entry = self._entries.get(pdf_id)
+        if entry is None:
+            # Written by another worker or before a restart; metadata for a
+            # content-addressed ID never changes, so read it only once
+            try:
+                with open(self._path(pdf_id) + ".meta.json", "rb") as meta_file:
+                    entry = IndexEntry(**orjson.loads(meta_file.read()))
+            except FileNotFoundError:
+                return None
+            self._entries[pdf_id] = entry
+        return entry
+
+    async def get(self, pdf_id: str) -> Optional[HNSWVectorStore]:
+        """Return the store for a PDF, memory-mapping it from disk if needed"""
+        if pdf_id not in self:
+            self._loaded.pop(pdf_id, None)
+            return None
+
+        store = self._loaded.get(pdf_id)
+        if store is not None:
+            self._loaded.move_to_end(pdf_id)
+            return store
+
+        # Parsing the chunk sidecar and mapping the index happen on a worker
+        # thread so large stores do not block the event loop
+        store = await asyncio.to_thread(HNSWVectorStore.load, self._path(pdf_id), view=True)
+        self._remember(pdf_id, store)
+        return store
+
+    async def put(self, pdf_id: str, store: HNSWVectorStore, filename: str) -> IndexEntry:
+        """Persist a store and its metadata to disk and keep it loaded"""
+        entry = IndexEntry(filename=filename, chunks_count=len(store))
+        # Writing happens on a worker thread, like PDF parsing in upload_pdf
+        await asyncio.to_thread(self._write, pdf_id, store, entry)
+        self._entries[pdf_id] = entry
+        self._remember(pdf_id, store)
+        return entry
+
+    def _write(self, pdf_id: str, store: HNSWVectorStore, entry: IndexEntry) -> None:
+        store.save(self._path(pdf_id))
+        # The metadata file marks the store as present, so it is written last,
+        # under a temporary name that is unique to this writer
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f"{pdf_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as meta_file:
+                meta_file.write(orjson.dumps(asdict(entry)))
+            os.replace(temp_path, self._path(pdf_id) + ".meta.json")
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def delete(self, pdf_id: str) -> bool:
+        """Remove a store from memory and disk; return whether it existed"""
+        self._loaded.pop(pdf_id, None)
+        self._entries.pop(pdf_id, None)
+        if pdf_id not in self:
+            return False
+        # Remove the metadata first so the store disappears atomically for readers
+        for suffix in (".meta.json", ".json", ".usearch"):
+            try:
+                os.unlink(self._path(pdf_id) + suffix)
+            except FileNotFoundError:
+                pass
+        return True
+
+    def _remember(self, pdf_id: str, store: HNSWVectorStore) -> None:
+        self._loaded[pdf_id] = store
+        self._loaded.move_to_end(pdf_id)
+        if len(self._loaded) > self.max_loaded:
+            # Dropping the last reference releases the index memory or mapping
+            self._loaded.popitem(last=False)
+
+# Global storage for vector databases, persisted across restarts and workers
+vector_databases = IndexCache(VECTOR_INDEX_DIR)
+
+# Pool of OpenAI clients keyed by API key so each user's HTTPS connections are
+# reused across requests instead of re-handshaking every time
+CLIENT_POOL_SIZE = 32
+_client_pool: "OrderedDict[str, AsyncOpenAI]" = OrderedDict()
+
+def get_client(api_key: str) -> AsyncOpenAI:
+    """Return a pooled async OpenAI client for the given API key"""
+    client = _client_pool.get(api_key)
+    if client is not None:
+        _client_pool.move_to_end(api_key)
+        return client
+
+    client = AsyncOpenAI(api_key=api_key)
+    _client_pool[api_key] = client
+    if len(_client_pool) > CLIENT_POOL_SIZE:
+        # Only drop the pool's reference: requests still streaming through the
+        # evicted client keep it alive, and its connections are released once
+        # the last of them finishes and it is garbage-collected
+        _client_pool.popitem(last=False)
+    return client
+
+# LRU cache of query embeddings keyed by (embedding model name, text), so
+# repeated questions and topics skip the OpenAI embedding round-trip
+EMBEDDING_CACHE_SIZE = 4096
+_embedding_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+
+async def embed_query(text: str, api_key: str) -> np.ndarray:
+    """Return the embedding for a query, reusing cached results for repeated text"""
+    key = (EMBEDDING_MODEL_NAME, text)
+    cached = _embedding_cache.get(key)
+    if cached is not None:
+        _embedding_cache.move_to_end(key)
+        return cached
+
+    # Embed with the requester's key: persisted stores outlive the uploader's
+    response = await get_client(api_key).embeddings.create(input=text, model=EMBEDDING_MODEL_NAME)
+    embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+    embedding.flags.writeable = False  # Shared between requests
+    _embedding_cache[key] = embedding
+    if len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+        _embedding_cache.popitem(last=False)
+    return embedding
+
+# LRU cache of retrieved chunks keyed by (pdf_id, normalized query, k); hits skip
+# both the query embedding and the index search
+RETRIEVAL_CACHE_SIZE = 1024
+_retrieval_cache: "OrderedDict[Tuple[str, str, int], List[str]]" = OrderedDict()
+_retrieval_locks: Dict[Tuple[str, str, int], asyncio.Lock] = {}
+
+async def retrieve(pdf_id: str, query: str, k: int, api_key: str) -> List[str]:
+    """Return the k most relevant chunks of a PDF for a query, with caching"""
+    # Embed the normalized text so the cached result matches what the key describes
+    normalized_query = query.strip().lower()
+    key = (pdf_id, normalized_query, k)
+    cached = _retrieval_cache.get(key)
+    if cached is not None:
+        _retrieval_cache.move_to_end(key)
+        return cached
+
+    # Concurrent misses for the same key wait for the first one instead of
+    # all embedding and searching at once
+    lock = _retrieval_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            cached = _retrieval_cache.get(key)
+            if cached is None:
+                vector_db = await vector_databases.get(pdf_id)
+                if vector_db is None:
+                    return []
+                query_vector = await embed_query(normalized_query, api_key)
+                cached = vector_db.search_by_vector(query_vector, k=k, return_as_text=True)
+                _retrieval_cache[key] = cached
+                if len(_retrieval_cache) > RETRIEVAL_CACHE_SIZE:
+                    _retrieval_cache.popitem(last=False)
+            return cached
+    finally:
+        if not lock.locked():
+            _retrieval_locks.pop(key, None)
+
+def forget_retrievals(pdf_id: str) -> None:
+    """Drop cached retrieval results for a PDF whose index changed or was deleted"""
+    for key in [key for key in _retrieval_cache if key[0] == pdf_id]:
+        del _retrieval_cache[key]
 
 # Define the data model for chat requests using Pydantic
 # This ensures incoming request data is properly validated
@@ -47,14 +283,178 @@ class ChatRequest(BaseModel):
 class QuestionGenerationRequest(BaseModel):
     topic: str  # Selected topic for question generation
     pdf_id: Optional[str] = None  # Optional PDF ID for context-aware questions
-    question_count: Optional[int] = 1  # Number of questions to generate
+    question_count: int = Field(1, ge=1)  # Number of questions to generate (at least 1)
     difficulty: Optional[str] = "medium"  # Difficulty level: easy, medium, hard
     question_types: Optional[List[str]] = ["factual", "analytical"]  # Types of questions
     api_key: str  # OpenAI API key for authentication
     model: Optional[str] = "gpt-4o-mini"  # Model to use for generation
 
+# Define the data model for a generated multiple choice question
+class MultipleChoiceQuestion(BaseModel):
+    question: str  # The question text
+    choices: List[str] = Field(min_length=4, max_length=4)  # Exactly 4 answer choices
+    correct_answer: int = Field(ge=0, le=3)  # Index of the correct choice
+    explanation: str  # Why the correct answer is correct
+
+# Response models for the JSON endpoints; FastAPI serializes these straight to
+# JSON bytes in pydantic-core instead of going through jsonable_encoder + json
+class UploadResponse(BaseModel):
+    pdf_id: str  # Content-derived ID of the indexed PDF
+    filename: str  # Name of the uploaded file
+    chunks_count: int  # Number of chunks indexed
+    message: str  # Human readable status
+
+class PDFInfo(BaseModel):
+    pdf_id: str  # Content-derived ID of the indexed PDF
+    filename: str  # Name of the file when it was first indexed
+    chunks_count: int  # Number of chunks indexed
+
+class PDFListResponse(BaseModel):
+    pdfs: List[PDFInfo]  # All indexed PDFs
+
+class MessageResponse(BaseModel):
+    message: str  # Human readable status
+
+class HealthResponse(BaseModel):
+    status: str  # "ok" when the API is up
+
+class JSONObjectStreamParser:
+    """Extract complete top-level JSON objects from text that arrives in pieces
+
+    Braces are counted outside of string literals, so each question object in
+    the model's JSON array is returned as soon as its closing brace arrives.
+    Text between objects (array brackets, commas, code fences) is ignored.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> List[str]:
+        """Consume the next piece of text and return any objects it completed"""
+        objects = []
+        for char in text:
+            if self._depth:
+                self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"' and self._depth:
+                self._in_string = True
+            elif char == "{":
+                if not self._depth:
+                    self._buffer = [char]
+                self._depth += 1
+            elif char == "}" and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    objects.append("".join(self._buffer))
+        return objects
+
+def shuffle_choices(question: dict) -> dict:
+    """Shuffle a question's answer choices in place to prevent bias"""
+    original_correct_answer = question["correct_answer"]
+    choices = question["choices"].copy()
+    
+    # Create a list of indices and shuffle them
+    indices = list(range(4))
+    random.shuffle(indices)
+    
+    # Reorder choices according to shuffled indices
+    question["choices"] = [choices[i] for i in indices]
+    
+    # Find where the original correct answer ended up
+    question["correct_answer"] = indices.index(original_correct_answer)
+    return question
+
+def fallback_question(topic: str) -> dict:
+    """Create a simple multiple choice question with a randomized answer"""
+    fallback_choices = [
+        "It involves criminal penalties",
+        "It is a civil matter only", 
+        "It has no legal implications",
+        "It depends on the specific circumstances"
+    ]
+    correct_choice = "It depends on the specific circumstances"
+    
+    # Shuffle the choices
+    random.shuffle(fallback_choices)
+    
+    return {
+        "question": f"What are the key legal aspects of {topic}?",
+        "choices": fallback_choices,
+        "correct_answer": fallback_choices.index(correct_choice),  # New position of the correct answer
+        "explanation": "Legal matters often depend on specific circumstances and context."
+    }
+
+# Prompt building blocks for question generation, allocated once at import
+DIFFICULTY_INSTRUCTIONS = {
+    "easy": "Generate simple, straightforward questions that test basic understanding and recall.",
+    "medium": "Generate moderately complex questions that require some analysis and understanding of relationships.",
+    "hard": "Generate challenging questions that require critical thinking, synthesis, and deep analysis."
+}
+
+QUESTION_TYPE_INSTRUCTIONS = {
+    "factual": "Ask direct questions about facts, definitions, and specific information.",
+    "analytical": "Ask questions that require analysis, comparison, and interpretation.",
+    "application": "Ask questions about how concepts apply to real-world scenarios.",
+    "synthesis": "Ask questions that require combining multiple concepts or ideas."
+}
+
+QUESTION_PROMPT_TEMPLATE = """You are an expert legal educator creating {difficulty} level MULTIPLE CHOICE questions about "{topic}".
+
+DIFFICULTY LEVEL: {difficulty_instruction}
+
+QUESTION TYPES TO INCLUDE: {question_type_instructions}
+
+INSTRUCTIONS:
+1. Generate exactly {question_count} multiple choice question(s) about "{topic}"
+2. Each question should be clear, specific, and educational
+3. Vary the question types as requested: {question_types}
+4. Each question must have exactly 4 answer choices (A, B, C, D)
+5. Make questions that would help someone learn about this legal topic
+6. Return questions in this EXACT JSON format:
+
+[
+  {{
+    "question": "What is the definition of...",
+    "choices": ["Choice A", "Choice B", "Choice C", "Choice D"],
+    "correct_answer": 0,
+    "explanation": "Brief explanation of why this is correct"
+  }}
+]
+
+IMPORTANT: Return ONLY valid JSON array. No additional text or formatting.
+
+"""
+
+CONTEXT_PROMPT_TEMPLATE = """
+RELEVANT CONTEXT FROM UPLOADED DOCUMENT:
+{context_text}
+
+Use this context to create more specific and relevant questions about "{topic}".
+"""
+
+NO_CONTEXT_PROMPT_TEMPLATE = """
+No specific document context provided. Generate general questions about "{topic}" based on your knowledge of legal concepts.
+"""
+
+# Completion token budget for question generation, scaled by question count
+MAX_QUESTION_TOKENS = 2000
+TOKENS_PER_QUESTION = 220
+QUESTION_TOKEN_OVERHEAD = 120
+
+# Size of the pieces an uploaded PDF is copied to disk in
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 # PDF upload endpoint
-@app.post("/api/upload-pdf")
+@app.post("/api/upload-pdf", response_model=UploadResponse)
 async def upload_pdf(file: UploadFile = File(...), api_key: str = Form(...)):
     """Upload and process a PDF file for RAG functionality"""
     try:
@@ -62,34 +462,48 @@ async def upload_pdf(file: UploadFile = File(...), api_key: str = Form(...)):
         if not file.filename or not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
         
-        # Create a temporary file to store the uploaded PDF
+        # Stream the uploaded PDF into a temporary file in 1 MiB pieces so the
+        # whole body is never held in memory at once, hashing it on the way
+        content_hash = hashlib.blake2b(digest_size=8)
         with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                content_hash.update(chunk)
+                temp_file.write(chunk)
             temp_file_path = temp_file.name
         
+        # Identify the PDF by its content so re-uploads reuse the existing index
+        pdf_id = f"pdf_{content_hash.hexdigest()}"
+        
         try:
-            # Load and process the PDF
+            # Skip parsing and embedding entirely if this PDF is already indexed
+            existing_entry = vector_databases.entry(pdf_id)
+            if existing_entry is not None:
+                return {
+                    "pdf_id": pdf_id,
+                    "filename": file.filename,
+                    "chunks_count": existing_entry.chunks_count,
+                    "message": "PDF already indexed"
+                }
+            
+            # Load and process the PDF on a worker thread so parsing does not
+            # block other requests on the event loop
             pdf_loader = PDFLoader(temp_file_path)
-            pdf_loader.load_file()
+            await asyncio.to_thread(pdf_loader.load_file)
             
-            # Split the text into chunks
-            text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-            chunks = text_splitter.split_texts(pdf_loader.documents)
+            # Split the text into chunks, also off the event loop
+            text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+            chunks = await asyncio.to_thread(text_splitter.split_texts, pdf_loader.documents)
             
             # Create embedding model with the provided API key
-            os.environ["OPENAI_API_KEY"] = api_key
-            embedding_model = EmbeddingModel()
+            embedding_model = EmbeddingModel(EMBEDDING_MODEL_NAME, api_key=api_key)
             
-            # Create vector database and build from chunks
-            vector_db = VectorDatabase(embedding_model=embedding_model)
+            # Create an HNSW vector store and build it from chunks
+            vector_db = HNSWVectorStore(embedding_model=embedding_model)
             vector_db = await vector_db.abuild_from_list(chunks)
             
-            # Generate a unique ID for this PDF
-            pdf_id = f"pdf_{hash(file.filename + str(len(chunks)))}"
-            
-            # Store the vector database
-            vector_databases[pdf_id] = vector_db
+            # Persist the vector database
+            await vector_databases.put(pdf_id, vector_db, file.filename)
+            forget_retrievals(pdf_id)
             
             return {
                 "pdf_id": pdf_id,
@@ -110,8 +524,8 @@ async def upload_pdf(file: UploadFile = File(...), api_key: str = Form(...)):
 @app.post("/api/chat")
 async def chat(request: ChatRequest):
     try:
-        # Initialize OpenAI client with the provided API key
-        client = OpenAI(api_key=request.api_key)
+        # Get a pooled async OpenAI client so streaming stays on the event loop
+        client = get_client(request.api_key)
         
         # Prepare messages
         messages = [{"role": "system", "content": request.developer_message}]
@@ -119,13 +533,12 @@ async def chat(request: ChatRequest):
         # If PDF ID is provided, retrieve relevant context
         context_message = ""
         if request.pdf_id and request.pdf_id in vector_databases:
-            vector_db = vector_databases[request.pdf_id]
-            
             # Search for relevant chunks based on user message
-            relevant_chunks = vector_db.search_by_text(
-                request.user_message, 
+            relevant_chunks = await retrieve(
+                request.pdf_id,
+                request.user_message,
                 k=3,  # Get top 3 most relevant chunks
-                return_as_text=True
+                api_key=request.api_key
             )
             
             if relevant_chunks:
@@ -144,14 +557,14 @@ async def chat(request: ChatRequest):
         # Create an async generator function for streaming responses
         async def generate():
             # Create a streaming chat completion request
-            stream = client.chat.completions.create(
+            stream = await client.chat.completions.create(
                 model=request.model,
                 messages=messages,
                 stream=True  # Enable streaming response
             )
             
             # Yield each chunk of the response as it becomes available
-            for chunk in stream:
+            async for chunk in stream:
                 if chunk.choices[0].delta.content is not None:
                     yield chunk.choices[0].delta.content
 
@@ -163,23 +576,28 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 # Get list of uploaded PDFs
-@app.get("/api/pdfs")
+@app.get("/api/pdfs", response_model=PDFListResponse)
 async def list_pdfs():
     """Get list of uploaded and indexed PDFs"""
     pdf_list = []
-    for pdf_id, vector_db in vector_databases.items():
+    for pdf_id in vector_databases.ids():
+        # Read the counts recorded at ingest time instead of loading each index
+        entry = vector_databases.entry(pdf_id)
+        if entry is None:
+            continue  # Deleted by another worker since listing
         pdf_list.append({
             "pdf_id": pdf_id,
-            "chunks_count": len(vector_db.vectors)
+            "filename": entry.filename,
+            "chunks_count": entry.chunks_count
         })
     return {"pdfs": pdf_list}
 
-# Delete a PDF from memory
-@app.delete("/api/pdfs/{pdf_id}")
+# Delete a PDF from memory and disk
+@app.delete("/api/pdfs/{pdf_id}", response_model=MessageResponse)
 async def delete_pdf(pdf_id: str):
-    """Delete a PDF from memory"""
-    if pdf_id in vector_databases:
-        del vector_databases[pdf_id]
+    """Delete a PDF from memory and disk"""
+    if vector_databases.delete(pdf_id):
+        forget_retrievals(pdf_id)
         return {"message": "PDF deleted successfully"}
     else:
         raise HTTPException(status_code=404, detail="PDF not found")
@@ -187,174 +605,115 @@ async def delete_pdf(pdf_id: str):
 # Generate random questions based on topic
 @app.post("/api/generate-questions")
 async def generate_questions(request: QuestionGenerationRequest):
-    """Generate random questions based on selected topic and optional PDF context"""
+    """Generate random questions based on selected topic and optional PDF context
+
+    Streams JSON lines: one metadata object, then one question object per line
+    """
     try:
-        # Initialize OpenAI client with the provided API key
-        os.environ["OPENAI_API_KEY"] = request.api_key
-        client = OpenAI(api_key=request.api_key)
+        # Get a pooled async OpenAI client for the provided API key
+        client = get_client(request.api_key)
         
         # Build the context for question generation
         context_chunks = []
         if request.pdf_id and request.pdf_id in vector_databases:
-            vector_db = vector_databases[request.pdf_id]
-            
             # Search for relevant chunks based on the topic
             try:
-                relevant_chunks = vector_db.search_by_text(
-                    request.topic, 
+                context_chunks = await retrieve(
+                    request.pdf_id,
+                    request.topic,
                     k=5,  # Get top 5 most relevant chunks
-                    return_as_text=True
+                    api_key=request.api_key
                 )
-                context_chunks = relevant_chunks
             except Exception as e:
-                print(f"Error searching vector database: {e}")
+                logger.warning("Error searching vector database: %s", e)
                 # Continue without context if search fails
         
-        # Build the prompt for question generation
-        difficulty_instructions = {
-            "easy": "Generate simple, straightforward questions that test basic understanding and recall.",
-            "medium": "Generate moderately complex questions that require some analysis and understanding of relationships.",
-            "hard": "Generate challenging questions that require critical thinking, synthesis, and deep analysis."
-        }
-        
-        question_type_instructions = {
-            "factual": "Ask direct questions about facts, definitions, and specific information.",
-            "analytical": "Ask questions that require analysis, comparison, and interpretation.",
-            "application": "Ask questions about how concepts apply to real-world scenarios.",
-            "synthesis": "Ask questions that require combining multiple concepts or ideas."
-        }
-        
-        # Create the system prompt
-        system_prompt = f"""You are an expert legal educator creating {request.difficulty} level MULTIPLE CHOICE questions about "{request.topic}".
-
-DIFFICULTY LEVEL: {difficulty_instructions.get(request.difficulty, difficulty_instructions["medium"])}
-
-QUESTION TYPES TO INCLUDE: {", ".join([question_type_instructions.get(qt, qt) for qt in request.question_types])}
-
-INSTRUCTIONS:
-1. Generate exactly {request.question_count} multiple choice question(s) about "{request.topic}"
-2. Each question should be clear, specific, and educational
-3. Vary the question types as requested: {", ".join(request.question_types)}
-4. Each question must have exactly 4 answer choices (A, B, C, D)
-5. Make questions that would help someone learn about this legal topic
-6. Return questions in this EXACT JSON format:
-
-[
-  {{
-    "question": "What is the definition of...",
-    "choices": ["Choice A", "Choice B", "Choice C", "Choice D"],
-    "correct_answer": 0,
-    "explanation": "Brief explanation of why this is correct"
-  }}
-]
-
-IMPORTANT: Return ONLY valid JSON array. No additional text or formatting.
-
-"""
+        # Assemble the system prompt from the module-level templates
+        prompt_parts = [
+            QUESTION_PROMPT_TEMPLATE.format(
+                difficulty=request.difficulty,
+                topic=request.topic,
+                difficulty_instruction=DIFFICULTY_INSTRUCTIONS.get(request.difficulty, DIFFICULTY_INSTRUCTIONS["medium"]),
+                question_type_instructions=", ".join([QUESTION_TYPE_INSTRUCTIONS.get(qt, qt) for qt in request.question_types]),
+                question_count=request.question_count,
+                question_types=", ".join(request.question_types),
+            )
+        ]
 
         # Add context if available
         if context_chunks:
             context_text = "\n\n".join([f"Context {i+1}: {chunk}" for i, chunk in enumerate(context_chunks)])
-            system_prompt += f"""
-RELEVANT CONTEXT FROM UPLOADED DOCUMENT:
-{context_text}
-
-Use this context to create more specific and relevant questions about "{request.topic}".
-"""
+            prompt_parts.append(CONTEXT_PROMPT_TEMPLATE.format(context_text=context_text, topic=request.topic))
         else:
-            system_prompt += f"""
-No specific document context provided. Generate general questions about "{request.topic}" based on your knowledge of legal concepts.
-"""
+            prompt_parts.append(NO_CONTEXT_PROMPT_TEMPLATE.format(topic=request.topic))
+        system_prompt = "".join(prompt_parts)
 
-        # Generate questions using OpenAI
-        response = client.chat.completions.create(
+        # Start streaming questions from OpenAI; failures such as an invalid
+        # key surface here as a normal HTTP error, before the response starts
+        stream = await client.chat.completions.create(
             model=request.model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": f"Generate {request.question_count} multiple choice questions about '{request.topic}' with {request.difficulty} difficulty level."}
             ],
             temperature=0.7,  # Balanced creativity and consistency
-            max_tokens=2000
+            # Budget ~220 tokens per question plus JSON overhead, capped at 2000
+            max_tokens=min(MAX_QUESTION_TOKENS, TOKENS_PER_QUESTION * request.question_count + QUESTION_TOKEN_OVERHEAD),
+            stream=True  # Enable streaming response
         )
         
-        # Parse the response to extract questions
-        questions_text = response.choices[0].message.content.strip()
-        
-        try:
-            # Try to parse as JSON
-            import json
-            questions_data = json.loads(questions_text)
-            
-            # Validate the structure
-            if not isinstance(questions_data, list):
-                raise ValueError("Response is not a JSON array")
-                
-            for i, q in enumerate(questions_data):
-                if not all(key in q for key in ["question", "choices", "correct_answer", "explanation"]):
-                    raise ValueError(f"Question {i+1} missing required fields")
-                if not isinstance(q["choices"], list) or len(q["choices"]) != 4:
-                    raise ValueError(f"Question {i+1} must have exactly 4 choices")
-                if not (0 <= q["correct_answer"] <= 3):
-                    raise ValueError(f"Question {i+1} correct_answer must be 0-3")
-            
-            # Shuffle answer choices to prevent bias
-            for question in questions_data:
-                original_correct_answer = question["correct_answer"]
-                choices = question["choices"].copy()
-                
-                # Create a list of indices and shuffle them
-                indices = list(range(4))
-                random.shuffle(indices)
-                
-                # Reorder choices according to shuffled indices
-                shuffled_choices = [choices[i] for i in indices]
-                
-                # Find where the original correct answer ended up
-                new_correct_answer = indices.index(original_correct_answer)
-                
-                # Update the question with shuffled choices and new correct answer index
-                question["choices"] = shuffled_choices
-                question["correct_answer"] = new_correct_answer
-            
-        except (json.JSONDecodeError, ValueError) as e:
-            # Fallback: create a simple multiple choice question with randomized answer
-            print(f"Failed to parse JSON response: {e}")
-            fallback_choices = [
-                "It involves criminal penalties",
-                "It is a civil matter only", 
-                "It has no legal implications",
-                "It depends on the specific circumstances"
-            ]
-            correct_choice = "It depends on the specific circumstances"
-            
-            # Shuffle the choices
-            random.shuffle(fallback_choices)
-            
-            # Find the new position of the correct answer
-            new_correct_index = fallback_choices.index(correct_choice)
-            
-            questions_data = [{
-                "question": f"What are the key legal aspects of {request.topic}?",
-                "choices": fallback_choices,
-                "correct_answer": new_correct_index,
-                "explanation": "Legal matters often depend on specific circumstances and context."
-            }]
-        
-        return {
+        metadata = {
             "topic": request.topic,
-            "questions": questions_data[:request.question_count],
             "difficulty": request.difficulty,
             "question_types": request.question_types,
             "has_context": len(context_chunks) > 0,
             "context_chunks_used": len(context_chunks)
         }
         
+        # Create an async generator that emits JSON lines: the metadata first,
+        # then each question as soon as its closing brace has streamed in
+        async def generate():
+            yield orjson.dumps(metadata) + b"\n"
+            
+            parser = JSONObjectStreamParser()
+            questions_sent = 0
+            try:
+                async for chunk in stream:
+                    if not chunk.choices or chunk.choices[0].delta.content is None:
+                        continue
+                    for question_json in parser.feed(chunk.choices[0].delta.content):
+                        try:
+                            question = MultipleChoiceQuestion.model_validate_json(question_json)
+                        except ValidationError as e:
+                            logger.warning("Skipping invalid question in response: %s", e)
+                            continue
+                        
+                        yield orjson.dumps(shuffle_choices(question.model_dump())) + b"\n"
+                        questions_sent += 1
+                        if questions_sent >= request.question_count:
+                            return
+            except Exception as e:
+                logger.warning("Question stream failed: %s", e)
+            finally:
+                # Release the upstream completion on every exit path (enough
+                # questions, short completion, or client disconnect) so we stop
+                # generating and paying for tokens nobody will read
+                await stream.close()
+            
+            # Fallback: send a generic question if nothing valid was generated
+            if questions_sent == 0:
+                logger.warning("No valid questions in response, sending fallback question")
+                yield orjson.dumps(fallback_question(request.topic)) + b"\n"
+        
+        # Return a streaming JSON lines response to the client
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+        
     except Exception as e:
         # Handle any errors that occur during processing
         raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}") from e
 
 # Define a health check endpoint to verify API status
-@app.get("/api/health")
+@app.get("/api/health", response_model=HealthResponse)
 async def health_check():
     return {"status": "ok"}
 
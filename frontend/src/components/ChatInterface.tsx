@@ -10,7 +10,11 @@ import { ChatMessage } from "./ChatMessage";
 import { TypingIndicator } from "./TypingIndicator";
 import { PDFUpload } from "./PDFUpload";
 import { TopicSelector, QuestionConfig } from "./TopicSelector";
-import { ChatApiService, QuestionGenerationRequest } from "@/services/chatApi";
+import {
+  ChatApiService,
+  GeneratedQuestions,
+  QuestionGenerationRequest,
+} from "@/services/chatApi";
 import { generateMessageId, storage } from "@/lib/utils";
 import { Send, Trash2, Settings, FileText } from "lucide-react";
 
@@ -208,11 +212,12 @@ export function ChatInterface() {
   };
 
   const handlePDFUploaded = (pdf: UploadedPDF) => {
-    // Add the new PDF to the list
+    // Add the new PDF to the list (re-uploads of the same file share an ID)
     setUploadedPDFs((prev) => [
-      ...prev,
+      ...prev.filter((item) => item.pdf_id !== pdf.pdf_id),
       {
         pdf_id: pdf.pdf_id,
+        filename: pdf.filename,
         chunks_count: pdf.chunks_count,
       },
     ]);
@@ -251,26 +256,42 @@ export function ChatInterface() {
         model: "gpt-4o-mini",
       };
 
-      const result = await ChatApiService.generateQuestions(request);
-
-      // Add questions as a chat message
-      const questionsMessage: Message = {
-        id: generateMessageId(),
-        content: `Generated ${result.questions.length} questions about "${result.topic}"`,
-        role: "questions",
-        timestamp: new Date(),
-        questions: result.questions,
-        topic: result.topic,
-        difficulty: result.difficulty,
-        question_types: result.question_types,
-        has_context: result.has_context,
-        context_chunks_used: result.context_chunks_used,
+      // Add questions as a chat message, updating it as more stream in
+      const questionsMessageId = generateMessageId();
+      const showQuestions = (result: GeneratedQuestions) => {
+        const questionsMessage: Message = {
+          id: questionsMessageId,
+          content: `Generated ${result.questions.length} questions about "${result.topic}"`,
+          role: "questions",
+          timestamp: new Date(),
+          questions: result.questions,
+          topic: result.topic,
+          difficulty: result.difficulty,
+          question_types: result.question_types,
+          has_context: result.has_context,
+          context_chunks_used: result.context_chunks_used,
+        };
+
+        setChatState((prev) => {
+          const exists = prev.messages.some(
+            (msg) => msg.id === questionsMessageId
+          );
+          return {
+            ...prev,
+            messages: exists
+              ? prev.messages.map((msg) =>
+                  msg.id === questionsMessageId ? questionsMessage : msg
+                )
+              : [...prev.messages, questionsMessage],
+          };
+        });
       };
 
-      setChatState((prev) => ({
-        ...prev,
-        messages: [...prev.messages, questionsMessage],
-      }));
+      const result = await ChatApiService.generateQuestions(
+        request,
+        showQuestions
+      );
+      showQuestions(result);
     } catch (error) {
       console.error("Error generating questions:", error);
       alert(
@@ -152,11 +152,14 @@ export class ChatApiService {
   }
 
   /**
-   * Generate questions based on a topic
+   * Generate questions based on a topic. The server streams JSON lines: a
+   * metadata object first, then one question per line as each is generated.
    * @param request - The question generation request payload
+   * @param onProgress - Optional callback with the questions received so far
    */
   static async generateQuestions(
-    request: QuestionGenerationRequest
+    request: QuestionGenerationRequest,
+    onProgress?: (result: GeneratedQuestions) => void
   ): Promise<GeneratedQuestions> {
     const response = await fetch(`${API_BASE_URL}/generate-questions`, {
       method: "POST",
@@ -173,7 +176,47 @@ export class ChatApiService {
       );
     }
 
-    return response.json();
+    const reader = response.body?.getReader();
+    if (!reader) {
+      throw new Error("No response body reader available");
+    }
+
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let metadata: Omit<GeneratedQuestions, "questions"> | null = null;
+    const questions: MultipleChoiceQuestion[] = [];
+
+    while (true) {
+      const { done, value } = await reader.read();
+
+      // Decode the chunk and split off every complete line
+      buffer += decoder.decode(value, { stream: !done });
+      const lines = buffer.split("\n");
+      buffer = done ? "" : lines.pop() ?? "";
+
+      for (const line of lines) {
+        if (!line.trim()) {
+          continue;
+        }
+        const data = JSON.parse(line);
+        if (metadata === null) {
+          // The first line describes the request
+          metadata = data;
+          continue;
+        }
+        questions.push(data);
+        onProgress?.({ ...metadata, questions: [...questions] });
+      }
+
+      if (done) {
+        break;
+      }
+    }
+
+    if (metadata === null) {
+      throw new Error("Empty response from question generation");
+    }
+    return { ...metadata, questions };
   }
 
   /**
@@ -46,5 +46,6 @@ export interface UploadedPDF {
 
 export interface PDFListItem {
   pdf_id: string;
+  filename?: string;
   chunks_count: number;
 }